@@ -20,13 +20,129 @@ References:
     Vasicek, Oldrich A. 'A Note on Using Cross-Sectional Information in Bayesian Estimation of \
         Security Betas'. The Journal of Finance 28, no. 5 (December 1973): 1233-39.
 """
-from itertools import chain, combinations
+from concurrent.futures import ThreadPoolExecutor
+import os
+
 import numpy as np
 
+# default estimator parameters, shared by ``Beta`` and the forecast combination models
+_EWMA_HALF_LIFE = 0.33
+_VASICEK_BETA_PRIOR = 1
+_VASICEK_SE_PRIOR = 0.5
+_WELCH_DELTA = 3
+_WELCH_AGED_RHO = 2 / 256
+_ROBECO_CORR_TARGET = 0.5
+_ROBECO_VOL_TARGET = 2
+_ROBECO_GAMMA = 0.5
+_ROBECO_PHI = 0.2
+
 
 def add_intercept(data: np.array) -> np.array:
     """Add column vector of ones to front of matrix."""
-    return np.hstack([np.ones((data.shape[0], 1)), data])
+    out = np.empty((data.shape[0], data.shape[1] + 1))
+    out[:, 0] = 1
+    out[:, 1:] = data
+    return out
+
+
+def _blume_adjust(beta: np.array) -> np.array:
+    """Shrink OLS beta towards unity as in Blume (1975)."""
+    return 0.67 * beta + 0.33
+
+
+def _simple_ols_slope(x: np.array, y: np.array, w: np.array = None) -> float:
+    """Slope of a (weighted) regression of ``y`` on ``x`` and an intercept in closed form."""
+    wx = x if w is None else w * x
+    sw = x.shape[0] if w is None else np.sum(w)
+    mx = np.sum(wx) / sw
+    my = (np.sum(y) if w is None else np.dot(w, y)) / sw
+    num = np.dot(wx, y) - sw * mx * my
+    den = np.dot(wx, x) - sw * mx * mx
+    return num / den
+
+
+def _co_moment(n: np.array, s_a: np.array, s_b: np.array, s_ab: np.array) -> np.array:
+    """Centred cross moment ``sum((a - mean(a)) * (b - mean(b)))`` from raw (weighted) sums."""
+    return s_ab - s_a * s_b / n
+
+
+def _decayed_cumsum(a: np.array, rho: float) -> np.array:
+    """Exponentially decayed running sum ``S_t = a_t + exp(-rho) * S_t-1``.
+
+    The recurrence is evaluated as a rescaled cumulative sum, in blocks short enough for the
+    scaling factor ``exp(rho * t)`` not to overflow.
+    """
+    out = np.empty(a.shape[0])
+    step = a.shape[0] if rho <= 0 else max(1, int(350 / rho))
+    carry = 0.0
+    for start in range(0, a.shape[0], step):
+        block = slice(start, min(start + step, a.shape[0]))
+        scale = np.exp(rho * np.arange(block.stop - block.start))
+        out[block] = (np.cumsum(a[block] * scale) + carry) / scale
+        carry = np.exp(-rho) * out[block.stop - 1]
+    return out
+
+
+def _ewma_weights(n_obs: int, half_life: float) -> np.array:
+    """Normalised EWMA weights for a sample of length ``n_obs``."""
+    h = np.log(2) / (n_obs * half_life)
+    weights = np.exp(-np.abs(n_obs - np.arange(1, n_obs + 1)) * h)
+    return weights / np.sum(weights)
+
+
+def _expanding_ewma(
+    x: np.array, y: np.array, lengths: np.array, half_life: float = _EWMA_HALF_LIFE
+) -> np.array:
+    """EWMA betas over expanding windows ``x[:n]``, ``y[:n]`` for each ``n`` in ``lengths``.
+
+    The slope does not depend on the scale of the weights, so they are left unnormalised and
+    built from one shared vector of distances to the window end.
+    """
+    distance = np.arange(x.shape[0])[::-1]
+    betas = np.empty(len(lengths))
+    for i, k in enumerate(lengths):
+        weights = np.exp(-distance[-k:] * (np.log(2) / (k * half_life)))
+        betas[i] = _simple_ols_slope(x[:k], y[:k], w=weights)
+    return betas
+
+
+def _vasicek_posterior(
+    beta: np.array, s_yy: np.array, s_xx: np.array, beta_prior: float, se_prior: float
+) -> np.array:
+    """Marginal posterior of beta given OLS estimate, residual variance and ``sum((x-mean)^2)``."""
+    std_error = np.sqrt(s_yy / s_xx)
+    num = beta_prior / np.square(se_prior) + beta / np.square(std_error)
+    den = 1 / np.square(se_prior) + 1 / np.square(std_error)
+    return num / den
+
+
+def _robeco_shrink(
+    corr: np.array,
+    vol_ratio: np.array,
+    corr_target: float,
+    vol_target: float,
+    gamma: float,
+    phi: float,
+) -> np.array:
+    """Product of correlation and volatility ratio, each shrunk towards its target."""
+    corr_shrink = (1 - gamma) * corr + gamma * corr_target
+    vol_shrink = (1 - phi) * vol_ratio + phi * vol_target
+    return corr_shrink * vol_shrink
+
+
+def _bma_combo_ssr(X: np.array, y: np.array, idx: np.array) -> tuple:
+    """OLS coefficients and SSRs of ``y`` on the columns ``idx[i]`` of a shared design ``X``.
+
+    Equivalent to ``lstsq(X[:, idx[i]], y)`` for every row of the ``mxp`` index array, but
+    all sub-designs are solved in one stacked call.
+    """
+    sub = np.moveaxis(X[:, idx], 1, 0)
+    # singular values of each sub-design below eps * max(M, N) * sigma_max are treated as
+    # zero, which is the cutoff ``lstsq`` uses with ``rcond=None``
+    rcond = np.finfo(X.dtype).eps * max(sub.shape[1:])
+    b = np.linalg.pinv(sub, rcond=rcond) @ y
+    resid = y - (sub @ b[..., None])[..., 0]
+    return b, np.sum(resid * resid, axis=1)
 
 
 class Beta:
@@ -37,32 +153,30 @@ class Beta:
             exog (np.array): benchmark or market return vector
             endog (np.array): asset or stock return vector
         """
-        self.exog = np.atleast_2d(exog).T
-        self.endog = np.atleast_2d(endog).T
-        self.n_obs = exog.shape[0]
-        self.exog_mat = add_intercept(self.exog)
-
-    def _weighted_ols(
-        self, X: np.array, y: np.array, w: np.array = None, demean: bool = False
-    ) -> np.array:
+        self.exog = np.ascontiguousarray(np.ravel(exog), dtype=np.float64)
+        self.endog = np.ascontiguousarray(np.ravel(endog), dtype=np.float64)
+        self.n_obs = self.exog.shape[0]
+
+        # centred market moments are shared by several estimators
+        self._exog_dm = self.exog - np.mean(self.exog)
+        self._s_xx = np.dot(self._exog_dm, self._exog_dm)
+
+    def _weighted_ols(self, X: np.array, y: np.array, w: np.array = None) -> np.array:
         """Helper class to calculate beta using WLS.
 
         Args:
             X (np.array): exogeneous variable (e.g. SPY)
             y (np.array): endogeneous variable (e.g. AAPL)
             w (np.array, optional): vector of weights. Defaults to None.
-            demean (bool, optional): subtract mean from ``X``. Defaults to False.
 
         Returns:
             np.array: vector of betas
         """
-        if demean:
-            X -= np.mean(X, axis=0)
-
-        if w is None:
-            w = np.ones(X.shape[0])
-        w = np.diag(w)
-        return np.linalg.inv(X.T @ w @ X) @ X.T @ w @ y
+        if w is not None:
+            # scale rows by sqrt(w) rather than building an ``n x n`` diagonal matrix
+            sw = np.sqrt(w)[:, None]
+            X, y = X * sw, y * sw
+        return np.linalg.solve(X.T @ X, X.T @ y)
 
     def ols(self, adjusted: bool = False) -> float:
         """Classic beta calculation using OLS.
@@ -76,12 +190,12 @@ class Beta:
         Returns:
             float: beta
         """
-        beta = np.ravel(self._weighted_ols(self.exog_mat, self.endog))[-1]
+        beta = np.dot(self._exog_dm, self.endog) / self._s_xx
         if adjusted:
-            return 0.67 * beta + 0.33
+            return _blume_adjust(beta)
         return beta
 
-    def ewma(self, half_life: float = 0.33) -> float:
+    def ewma(self, half_life: float = _EWMA_HALF_LIFE) -> float:
         r"""Exponentially weighted moving average beta using WLS.
 
         Beta is calculated using WLS and the following weights vector:
@@ -98,13 +212,12 @@ class Beta:
         Returns:
             float: beta
         """
-        h = np.log(2) / (self.n_obs * half_life)
-        weights = np.exp(-np.abs(self.n_obs - np.arange(1, self.n_obs + 1)) * h)
-        weights /= np.sum(weights)
-        beta = self._weighted_ols(self.exog_mat, self.endog, w=weights)
-        return np.ravel(beta)[1]
+        weights = _ewma_weights(self.n_obs, half_life)
+        return _simple_ols_slope(self.exog, self.endog, w=weights)
 
-    def vasicek(self, beta_prior: float = 1, se_prior: float = 0.5) -> float:
+    def vasicek(
+        self, beta_prior: float = _VASICEK_BETA_PRIOR, se_prior: float = _VASICEK_SE_PRIOR
+    ) -> float:
         """Bayesian estimation of beta using Vasicek (1973).
 
         Args:
@@ -114,16 +227,10 @@ class Beta:
         Returns:
             float: Vasicek beta
         """
-        beta = self._weighted_ols(self.exog_mat, self.endog)
-        endog_hat = self.exog_mat @ beta
-        s_yy = np.sum(np.square(self.endog - endog_hat)) / (self.n_obs - 2)
-        s_xx = np.sum(np.square(self.exog - np.mean(self.exog)))
-        std_error = np.sqrt(s_yy / s_xx)
-
-        # Bayesian estimation of marginal posterior
-        num = beta_prior / np.square(se_prior) + beta[1] / np.square(std_error)
-        den = 1 / np.square(se_prior) + 1 / np.square(std_error)
-        return np.ravel(num / den)[0]
+        beta = self.ols()
+        resid = self.endog - np.mean(self.endog) - beta * self._exog_dm
+        s_yy = np.dot(resid, resid) / (self.n_obs - 2)
+        return _vasicek_posterior(beta, s_yy, self._s_xx, beta_prior, se_prior)
 
     def dimson(self, lags: int = 1) -> float:
         """Dimson (1979) beta estimator for infrequently traded assets.
@@ -136,12 +243,12 @@ class Beta:
         """
         X_trimmed, y_trimmed = self.exog[lags:], self.endog[lags:]
         X_lagged = [self.exog[lags - i : -i] for i in range(1, lags + 1)]
-        X_mat = add_intercept(np.hstack([X_trimmed, *X_lagged]))
-        beta = np.ravel(self._weighted_ols(X_mat, y_trimmed))[1:]
+        X_mat = add_intercept(np.column_stack([X_trimmed, *X_lagged]))
+        beta = self._weighted_ols(X_mat, y_trimmed)[1:]
         idx = np.min([2, lags])
         return np.sum(beta[: idx + 1])
 
-    def welch(self, delta: float = 3, rho: float = 0) -> float:
+    def welch(self, delta: float = _WELCH_DELTA, rho: float = 0) -> float:
         """Slope winsorized beta using Welch (2021).
 
         A decay factor ``rho`` can be chosen such that more relevance is given
@@ -155,15 +262,20 @@ class Beta:
         Returns:
             float: Welch beta
         """
-        bm_min, bm_max = (1 - delta) * self.exog, (1 + delta) * self.exog
-        lower, upper = np.minimum(bm_min, bm_max), np.maximum(bm_min, bm_max)
-        endog_wins = np.atleast_2d(np.clip(self.endog, lower, upper))
+        # bounds are min/max of (1 -/+ delta) * exog, i.e. exog -/+ |delta * exog|
+        bound = np.abs(delta * self.exog)
+        endog_wins = np.clip(self.endog, self.exog - bound, self.exog + bound)
+        if rho == 0:
+            return np.dot(self._exog_dm, endog_wins) / self._s_xx
         weights = np.exp(-rho * np.arange(self.n_obs)[::-1])
-        beta = self._weighted_ols(self.exog_mat, endog_wins, w=weights)
-        return np.ravel(beta)[1]
+        return _simple_ols_slope(self.exog, endog_wins, w=weights)
 
     def robeco(
-        self, corr_target: float, vol_target: float, gamma: float = 0.5, phi: float = 0.2
+        self,
+        corr_target: float,
+        vol_target: float,
+        gamma: float = _ROBECO_GAMMA,
+        phi: float = _ROBECO_PHI,
     ) -> float:
         """Beta shrinkage using Blitz et al. (2022).
 
@@ -180,12 +292,11 @@ class Beta:
         Returns:
             float: Robeco beta
         """
-        corr = np.corrcoef(self.exog.T, self.endog.T)[0, 1]
-        corr_shrink = (1 - gamma) * corr + gamma * corr_target
-        vol_ratio = np.std(self.endog) / np.std(self.exog)
-        vol_shrink = (1 - phi) * vol_ratio + phi * vol_target
-        beta = corr_shrink * vol_shrink
-        return beta
+        endog_dm = self.endog - np.mean(self.endog)
+        s_yy, s_xy = np.dot(endog_dm, endog_dm), np.dot(self._exog_dm, endog_dm)
+        corr = s_xy / np.sqrt(self._s_xx * s_yy)
+        vol_ratio = np.sqrt(s_yy / self._s_xx)
+        return _robeco_shrink(corr, vol_ratio, corr_target, vol_target, gamma, phi)
 
     def scholes_williams(self, lag: int = 1) -> float:
         """Calculate shrunk beta using Scholes & Williams (1977).
@@ -196,61 +307,155 @@ class Beta:
         Returns:
             float: Scholes Williams beta
         """
-        beta_lead = np.ravel(self._weighted_ols(self.exog_mat[lag:, :], self.endog[:-lag, :]))[-1]
-        beta_lag = np.ravel(self._weighted_ols(self.exog_mat[:-lag, :], self.endog[lag:, :]))[-1]
-        beta = np.ravel(self._weighted_ols(self.exog_mat, self.endog))[-1]
-        auto_corr = np.corrcoef(self.exog[1:, :], self.exog[:-1, :], rowvar=False)[0, 1]
+        beta_lead = _simple_ols_slope(self.exog[lag:], self.endog[:-lag])
+        beta_lag = _simple_ols_slope(self.exog[:-lag], self.endog[lag:])
+        beta = self.ols()
+        auto_corr = np.corrcoef(self.exog[1:], self.exog[:-1])[0, 1]
 
         beta = (beta_lag + beta + beta_lead) / (1 + 2 * auto_corr)
         return beta
 
 
 class BetaForecastCombination:
-    def __init__(self, exog: np.array, endog: np.array, window: int = 21):
-        """Initialise exogeneous (X) and endogeneous (y) data."""
-        self.exog = np.atleast_2d(exog).T
-        self.endog = np.atleast_2d(endog).T
+    def __init__(self, exog: np.array, endog: np.array, window: int = 21, n_jobs: int = 1):
+        """Initialise exogeneous (X) and endogeneous (y) data.
+
+        Args:
+            exog (np.array): benchmark or market return vector
+            endog (np.array): asset or stock return vector
+            window (int, optional): size of the estimation window. Defaults to 21.
+            n_jobs (int, optional): threads used for the EWMA column, the only estimator
+                fitted window by window; all other estimators are vectorised and unaffected.
+                ``-1`` uses all cores. Threads rarely beat the serial loop on short windows.
+                Defaults to 1.
+
+        Raises:
+            ValueError: if ``n_jobs`` is 0 or below -1
+        """
+        if n_jobs == 0 or n_jobs < -1:
+            raise ValueError(f"n_jobs must be a positive integer or -1, got {n_jobs}")
+
+        self.exog = np.ascontiguousarray(np.ravel(exog), dtype=np.float64)
+        self.endog = np.ascontiguousarray(np.ravel(endog), dtype=np.float64)
         self.window = window
+        self.n_jobs = (os.cpu_count() or 1) if n_jobs == -1 else n_jobs
         self.n_obs = self.endog.shape[0]
         self.weights = None
 
-    def _generate_estimation_windows(self, data: np.array) -> list:
-        """Generate list of ``t+k`` expanding windows."""
-        return [data[: self.window + i] for i in range(data.shape[0] - self.window)]
-
     def _train_test_split(self) -> None:
         """Split data set into training and test periods given window cutoff."""
         cutoff = self.n_obs - self.window
-        self.train_data = np.hstack([self.exog[:cutoff, :], self.endog[:cutoff, :]])
-        self.test_data = np.hstack([self.exog[cutoff:, :], self.endog[cutoff:, :]])
+        self.train_data = np.column_stack([self.exog[:cutoff], self.endog[:cutoff]])
+        self.test_data = np.column_stack([self.exog[cutoff:], self.endog[cutoff:]])
 
     # TODO: allow kwargs to feed into beta estimation, also allow filter for methods
-    def _generate_betas(self, windows: list, **kwargs: dict) -> np.array:
-        """Generate betas from ``Beta`` class.
+    def _generate_betas(self, data: np.array, lengths: np.array, **kwargs: dict) -> np.array:
+        """Generate betas over expanding windows ``data[:n]`` for each ``n`` in ``lengths``.
+
+        Apart from EWMA, whose weights depend on the window length, every estimator is
+        built from cumulative sums so that each window costs O(1) instead of a new regression.
 
         Args:
-            windows (list): list of data windows
+            data (np.array): ``Tx2`` matrix of exogeneous and endogeneous returns
+            lengths (np.array): number of leading observations in each window
 
         Returns:
             np.array: ``Nxk`` matrix of betas.
         """
-        # set up iterator
-        beta_obj = [Beta(i[:, 0], i[:, 1]) for i in windows]
-        c, v = kwargs.get("corr_target", 0.5), kwargs.get("vol_target", 2)
-
-        # consume iterator and cast into 2d numpy array
-        ols = np.atleast_2d(list(map(lambda x: x.ols(), beta_obj))).T
-        adj_ols = np.atleast_2d(list(map(lambda x: x.ols(True), beta_obj))).T
-        vasicek = np.atleast_2d(list(map(lambda x: x.vasicek(), beta_obj))).T
-        ewma = np.atleast_2d(list(map(lambda x: x.ewma(), beta_obj))).T
-        dimson = np.atleast_2d(list(map(lambda x: x.dimson(), beta_obj))).T
-        welch = np.atleast_2d(list(map(lambda x: x.welch(), beta_obj))).T
-        aged_welch = np.atleast_2d(list(map(lambda x: x.welch(rho=2 / 256), beta_obj))).T
-        robeco = np.atleast_2d(list(map(lambda x: x.robeco(c, v), beta_obj))).T
-        schol_will = np.atleast_2d(list(map(lambda x: x.scholes_williams(), beta_obj))).T
-        models = [ols, adj_ols, vasicek, ewma, dimson, welch, aged_welch, robeco, schol_will]
-
-        return np.hstack(models)
+        c = kwargs.get("corr_target", _ROBECO_CORR_TARGET)
+        v = kwargs.get("vol_target", _ROBECO_VOL_TARGET)
+        x, y = np.ascontiguousarray(data[:, 0]), np.ascontiguousarray(data[:, 1])
+        n = np.asarray(lengths)
+        last, prev = n - 1, n - 2
+
+        # columns: ols, adj_ols, vasicek, ewma, dimson, welch, aged_welch, robeco, schol_will
+        betas = np.empty((n.shape[0], 9))
+
+        # cumulative sums over the first ``n`` observations
+        cx, cy = np.cumsum(x), np.cumsum(y)
+        cxx, cyy, cxy = np.cumsum(x * x), np.cumsum(y * y), np.cumsum(x * y)
+        s_xx = _co_moment(n, cx[last], cx[last], cxx[last])
+        s_yy = _co_moment(n, cy[last], cy[last], cyy[last])
+        s_xy = _co_moment(n, cx[last], cy[last], cxy[last])
+
+        betas[:, 0] = ols = s_xy / s_xx
+        betas[:, 1] = _blume_adjust(ols)
+        s_res = (s_yy - ols * s_xy) / (n - 2)
+        betas[:, 2] = _vasicek_posterior(ols, s_res, s_xx, _VASICEK_BETA_PRIOR, _VASICEK_SE_PRIOR)
+        if self.n_jobs > 1 and n.shape[0] > 1:
+            # EWMA cannot be built from cumulative sums, so spread its windows over threads
+            batches = np.array_split(n, min(self.n_jobs, n.shape[0]))
+            with ThreadPoolExecutor(self.n_jobs) as pool:
+                ewma = pool.map(lambda lengths: _expanding_ewma(x, y, lengths), batches)
+                betas[:, 3] = np.concatenate(list(ewma))
+        else:
+            betas[:, 3] = _expanding_ewma(x, y, n)
+
+        # Dimson with one lag: regress y_t on [1, x_t, x_t-1] using cumulative Gram matrices
+        Z = np.column_stack([np.ones(x.shape[0] - 1), x[1:], x[:-1]])
+        gram = np.cumsum(Z[:, :, None] * Z[:, None, :], axis=0)[prev]
+        moment = np.cumsum(Z * y[1:, None], axis=0)[prev]
+        betas[:, 4] = np.sum(np.linalg.solve(gram, moment[..., None])[:, 1:, 0], axis=1)
+
+        # Welch winsorises each observation independently so the clipped series is shared
+        bound = np.abs(_WELCH_DELTA * x)
+        y_wins = np.clip(y, x - bound, x + bound)
+        cyw, cxyw = np.cumsum(y_wins), np.cumsum(x * y_wins)
+        betas[:, 5] = _co_moment(n, cx[last], cyw[last], cxyw[last]) / s_xx
+
+        # weights decay from the end of each window, so the weighted sums follow a recurrence
+        rho = _WELCH_AGED_RHO
+        sw, swx = _decayed_cumsum(np.ones(x.shape[0]), rho)[last], _decayed_cumsum(x, rho)[last]
+        swy, swxx = _decayed_cumsum(y_wins, rho)[last], _decayed_cumsum(x * x, rho)[last]
+        swxy = _decayed_cumsum(x * y_wins, rho)[last]
+        betas[:, 6] = _co_moment(sw, swx, swy, swxy) / _co_moment(sw, swx, swx, swxx)
+
+        corr = s_xy / np.sqrt(s_xx * s_yy)
+        vol_ratio = np.sqrt(s_yy / s_xx)
+        betas[:, 7] = _robeco_shrink(corr, vol_ratio, c, v, _ROBECO_GAMMA, _ROBECO_PHI)
+
+        # Scholes & Williams with one lag: sums over x[1:n], x[:n-1], y[1:n] and y[:n-1]
+        m = n - 1
+        sx_lead, sx_lag = cx[last] - x[0], cx[prev]
+        sy_lead, sy_lag = cy[prev], cy[last] - y[0]
+        sxx_lead, sxx_lag = cxx[last] - x[0] ** 2, cxx[prev]
+        sxy_lead = np.cumsum(x[1:] * y[:-1])[prev]
+        sxy_lag = np.cumsum(x[:-1] * y[1:])[prev]
+        sxx_auto = np.cumsum(x[1:] * x[:-1])[prev]
+        var_lead = _co_moment(m, sx_lead, sx_lead, sxx_lead)
+        var_lag = _co_moment(m, sx_lag, sx_lag, sxx_lag)
+        beta_lead = _co_moment(m, sx_lead, sy_lead, sxy_lead) / var_lead
+        beta_lag = _co_moment(m, sx_lag, sy_lag, sxy_lag) / var_lag
+        auto_corr = _co_moment(m, sx_lead, sx_lag, sxx_auto) / np.sqrt(var_lead * var_lag)
+        betas[:, 8] = (beta_lag + ols + beta_lead) / (1 + 2 * auto_corr)
+        return betas
+
+    def _generate_betas_single(self, data: np.array, **kwargs: dict) -> np.array:
+        """Generate betas over the full ``data`` window, e.g. the test period.
+
+        Args:
+            data (np.array): ``Tx2`` matrix of exogeneous and endogeneous returns
+
+        Returns:
+            np.array: vector of ``k`` betas in the column order of ``_generate_betas``.
+        """
+        beta = Beta(data[:, 0], data[:, 1])
+        c = kwargs.get("corr_target", _ROBECO_CORR_TARGET)
+        v = kwargs.get("vol_target", _ROBECO_VOL_TARGET)
+        ols = beta.ols()
+        return np.array(
+            [
+                ols,
+                _blume_adjust(ols),
+                beta.vasicek(),
+                beta.ewma(),
+                beta.dimson(),
+                beta.welch(),
+                beta.welch(rho=_WELCH_AGED_RHO),
+                beta.robeco(c, v),
+                beta.scholes_williams(),
+            ]
+        )
 
     def fit(self) -> float:
         """Fit forecast combination model given window size.
@@ -262,35 +467,40 @@ class BetaForecastCombination:
         self._train_test_split()
 
         # calculate beta using expanding window
-        training_windows = self._generate_estimation_windows(self.train_data)
-        betas = self._generate_betas(training_windows)
+        windows = np.arange(self.window, self.train_data.shape[0])
+        betas = self._generate_betas(self.train_data, windows)
 
         # regress betas onto realised betas
         X_train = add_intercept(betas[:-1, :])
-        self.weights = np.linalg.pinv(X_train) @ betas[1:, 0]
+        self.weights = np.linalg.lstsq(X_train, betas[1:, 0], rcond=None)[0]
 
         # project weights onto test data
-        betas_test = self._generate_betas([self.test_data])
-        X_test = add_intercept(betas_test)
-        return np.ravel(X_test @ self.weights)[0]
+        X_test = np.append(1, self._generate_betas_single(self.test_data))
+        return X_test @ self.weights
 
 
 class BetaBMA(BetaForecastCombination):
-    def __init__(self, exog: np.array, endog: np.array, window: int = 21):
-        super().__init__(exog, endog, window)
+    def __init__(self, exog: np.array, endog: np.array, window: int = 21, n_jobs: int = 1):
+        super().__init__(exog, endog, window, n_jobs)
 
-    def _generate_beta_combinations(self, data: np.array) -> np.array:
-        """Combine ``k`` columns in all possible ways.
+    def _generate_beta_combinations(self, k: int) -> tuple:
+        """Combine ``k`` columns in all possible ways, excluding the empty and full set.
+
+        Combinations are enumerated as bitmasks and stored in a padded index table, so that
+        no tuple or list is allocated per combination.
 
         Args:
-            data (_type_): array with ``k`` columns
+            k (int): number of columns
 
         Returns:
-            np.array: array of possible combinations of column indices
+            tuple: ``(2^k-2)xk`` array of column indices (only the first ``p`` of each row
+                are valid) and vector of combination sizes ``p``
         """
-        indices = list(range(data.shape[0]))
-        combos = [np.array(list(combinations(indices, i))) for i in range(1, data.shape[0])]
-        return np.array(list(chain(*combos)), dtype=object)
+        masks = np.arange(1, (1 << k) - 1)
+        bits = (masks[:, None] >> np.arange(k)) & 1
+        combo_idx = np.argsort(-bits, axis=1, kind="stable").astype(np.int32)
+        combo_len = np.sum(bits, axis=1).astype(np.int32)
+        return combo_idx, combo_len
 
     def fit(self) -> float:
         """Fit Bayesian Model Averaging over specified window.
@@ -300,42 +510,44 @@ class BetaBMA(BetaForecastCombination):
         """
         # estimation windows for priors (train)
         self._train_test_split()
-        training_windows = self._generate_estimation_windows(self.train_data)
-        beta_train = self._generate_betas(training_windows)
-        beta_test = add_intercept(self._generate_betas([self.test_data]))
+        windows = np.arange(self.window, self.train_data.shape[0])
+        beta_train = self._generate_betas(self.train_data, windows)
+        beta_test = np.append(1, self._generate_betas_single(self.test_data))
 
         # get K beta combinations and set up model inputs
-        combos = self._generate_beta_combinations(beta_train[0])
-        g = 1 / min(len(training_windows), len(combos))
+        combo_idx, combo_len = self._generate_beta_combinations(beta_train.shape[1])
+        g = 1 / min(len(windows), len(combo_len))
         a_g = g / (1 + g)
 
-        # step 1: calculate SSR_r for restricted model
+        # lagged design shared by the restricted and all unrestricted models
+        beta_u = add_intercept(beta_train[:-1, :])
+        beta_y = beta_train[1:, 0]
+
+        # step 1: calculate SSR_r for restricted model, i.e. intercept and first lag of OLS
         # TODO: add variable number of lags into restricted model
         dof_r = 1
-        beta_r = add_intercept(beta_train[:-dof_r, [0]])
-        b_r_hat = np.linalg.pinv(beta_r) @ beta_train[dof_r:, [0]]
-        ssr_r = np.sum(np.square(beta_train[dof_r:, [0]] - beta_r @ b_r_hat))
+        beta_r = beta_u[:, : dof_r + 1]
+        b_r_hat = np.linalg.lstsq(beta_r, beta_y, rcond=None)[0]
+        resid_r = beta_y - beta_r @ b_r_hat
+        ssr_r = resid_r @ resid_r
+
+        # step 2: solve all beta combinations of the same size at once, store betas and SSRs
+        # per model. All models regress on columns of the same lagged design
+        design_idx = np.pad(combo_idx + 1, ((0, 0), (1, 0)))  # column 0 is the intercept
+        beta_k, ssr_u = np.empty(combo_len.shape[0]), np.empty(combo_len.shape[0])
+        for p in np.unique(combo_len):
+            models = combo_len == p
+            idx = design_idx[models, : p + 1]
 
-        # step 2: iterate over beta combinations, store as list of tuples
-        models = []
-        for combo in combos:
             # calculate SSR_u first using lagged realised betas
-            beta_u = add_intercept(beta_train[:-1, combo])
-            b_u_hat = np.linalg.pinv(beta_u) @ beta_train[1:, [0]]
-            ssr_u = np.sum(np.square(beta_train[1:, [0]] - beta_u @ b_u_hat))
+            b_u_hat, ssr_u[models] = _bma_combo_ssr(beta_u, beta_y, idx)
 
-            # project combined beta onto series of realised betas
-            weights = np.zeros((beta_train.shape[1] + 1, 1))
-            weights[0, :] = b_u_hat[0, :]
-            weights[combo + 1, :] = b_u_hat[1:, :]
-            beta_k = np.ravel(beta_test @ weights)[0]
-            models.append((combo.shape[0], beta_k, ssr_u))
+            # project combined betas onto series of realised betas
+            beta_k[models] = np.sum(beta_test[idx] * b_u_hat, axis=1)
 
         # step 3: calculate beta weights
-        weights = np.zeros(len(models))
-        for k, (p, _, ssr) in enumerate(models):
-            weights[k] = np.power(a_g, p / 2) * np.power(1 + 1 / g * (ssr / ssr_r), -dof_r / 2)
+        weights = a_g ** (0.5 * combo_len) * (1 + ssr_u / (g * ssr_r)) ** (-0.5 * dof_r)
 
         # step 4: combine weights with betas for final estimate
-        beta_bma = np.sum(np.array(models)[:, 1] * weights / np.sum(weights))
+        beta_bma = beta_k @ weights / np.sum(weights)
         return beta_bma